@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+from runcache           import CacheRunner
+from partition          import PartitionedCacheRunner
+
+
+# (cachetype, num_ways, num_sets), including set counts that aren't a multiple of the job count
+CONFIGS = [
+    ("dmc", 1, 16),
+    ("dmc", 1, 7),
+    ("dmc", 1, 1),
+    ("sac", 2, 8),
+    ("sac", 4, 5),
+    ("sac", 1, 8),
+]
+JOBS = [2, 3, 4]
+
+
+# Parse command-line arguments passed to the program
+def parse_cli_args():
+
+    parser = argparse.ArgumentParser(
+        description='check that --jobs N runs match serial runs exactly')
+
+    parser.add_argument(
+        'testfiles',
+        nargs='*',
+        help='trace files to check (default: a few random traces)')
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=1410,
+        help='seed for the random traces')
+
+    return parser.parse_args()
+
+
+def random_trace(path, rng, length, span):
+    # mostly reads/writes over `span` bytes of memory, with the odd malformed line
+    with open(path, "w") as f:
+        for _ in range(length):
+            addr = rng.randrange(0, span, 4)
+            roll = rng.random()
+            if roll < 0.45:
+                f.write(f"W 0x{addr:04x} {rng.randint(-1000, 1000)}\n")
+            elif roll < 0.97:
+                f.write(f"R 0x{addr:04x}\n")
+            else:
+                f.write("not an access\n")
+
+
+def cache_lines(runner):
+    # every cache line (way) of a DMC or SAC cache
+    if runner.cache_type == "dmc":
+        return list(runner.c.cache.values())
+    return [way for ways in runner.c.cache.values() for way in ways.values()]
+
+
+def compare(testfile, structure, ways, sets, jobs) -> list:
+    serial = CacheRunner(structure, ways, sets, testfile)
+    partitioned = PartitionedCacheRunner(structure, ways, sets, testfile, jobs)
+    serial_out, partitioned_out = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(serial_out):
+        serial.run()
+    with contextlib.redirect_stdout(partitioned_out):
+        partitioned.run()
+
+    problems = []
+    if serial_out.getvalue() != partitioned_out.getvalue():
+        problems.append("output")
+    if serial.stats() != partitioned.stats():
+        problems.append("stats")
+    if serial.c.cache != partitioned.c.cache:
+        problems.append("cache state")
+    if dict(serial.c.mm) != dict(partitioned.c.mm):
+        problems.append("main memory")
+    if getattr(serial.c, "last_use", None) != getattr(partitioned.c, "last_use", None):
+        problems.append("last_use")
+    # in a serial run a loaded cache line is the very list main memory holds
+    if not all(partitioned.c.mm[line["base_addr"]] is line["value"]
+               for line in cache_lines(partitioned) if not line["empty"]):
+        problems.append("cache/memory aliasing")
+    return problems
+
+
+def main():
+    cli_args = parse_cli_args()
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        testfiles = cli_args.testfiles
+        if not testfiles:
+            rng = random.Random(cli_args.seed)
+            for k, span in enumerate((0x400, 0x2000, 0x10000)):
+                testfiles.append(os.path.join(tmp, f"random{k}.test"))
+                random_trace(testfiles[-1], rng, 1000, span)
+
+        for testfile in testfiles:
+            for structure, ways, sets in CONFIGS:
+                for jobs in JOBS:
+                    if problems := compare(testfile, structure, ways, sets, jobs):
+                        failed += 1
+                        print(f"{structure} ({sets} set(s), {ways} way(s)) --jobs {jobs}: "
+                              f"error in {os.path.basename(testfile)}: {', '.join(problems)} differ")
+
+    if failed:
+        sys.exit(1)
+    print("partition: all tests passed!")
+
+
+if __name__ == '__main__':
+    main()
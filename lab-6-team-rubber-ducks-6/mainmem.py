@@ -1,5 +1,37 @@
 #!/usr/bin/env python3
 
+import os
+
+# parsed init files, keyed by path, so only the first Memory in a process reads the file
+_init_images = {}
+
+
+def load_init_image(init_file, words_per_block, block_size) -> dict:
+    '''
+    Reads a mem.data file once per process.
+    Returns { block-aligned address : tuple of the block's ints }.
+    '''
+    if init_file in _init_images:
+        return _init_images[init_file]
+
+    image = {}
+    block = []  # ints of the block currently being filled
+    with open(init_file, mode="rb") as mem_init:
+        i = 0   # index simulates an integer's "address" in main memory
+        while (byte := mem_init.read(4)):
+            # i is BLOCK_ALIGNED address which indexes a whole block (8 ints)
+            # { 0 : (int0, int1, int2, ... , int7), 32 : (int0, ...), 64 : (...), ...}
+            block.append(int.from_bytes(byte, byteorder="little", signed=True))
+            if len(block) >= words_per_block:
+                image[i] = tuple(block)
+                block = []
+                i += block_size
+    image[i] = tuple(block)     # trailing (possibly empty) block, as before
+
+    _init_images[init_file] = image
+    return image
+
+
 class Memory(dict):
     '''
     Reads memory from a mem.data file.  
@@ -13,29 +45,18 @@ class Memory(dict):
         self.MAIN_MEMORY_START_ADDR      = 0x0000
         self.MAIN_MEMORY_BLOCK_SIZE      = 32
         self.MAIN_MEMORY_BLOCK_SIZE_LN   = 5
-        self.MAIN_MEMORY_INIT_FILE       = "./mm_init.data"
+        self.MAIN_MEMORY_INIT_FILE       = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mm_init.data")
         self.MAIN_MEMORY_WORD_SIZE       = 4 # bytes (in accordance with RISC-V)
         self.MAIN_MEMORY_WORDS_PER_BLOCK = self.MAIN_MEMORY_BLOCK_SIZE / self.MAIN_MEMORY_WORD_SIZE
 
         self.write_queries  = 0
         self.read_queries   = 0
-        self[0]             = []    # initialize dictionary value to be a list
-
-        with open(self.MAIN_MEMORY_INIT_FILE, mode="rb") as mem_init:
-            i = 0   # index simulates an integer's "address" in main memory
-            j = 0   # indexes in a block
-            while (byte := mem_init.read(4)):
-                # insert into dictionary
-                # i is BLOCK_ALIGNED address which indexes a whole block (8 ints)
-                # j is an index to the relevant word in a block
-                # { 0 : [int0, int1, int2, ... , int7], 32 : [int0, ...], 64 : [...], ...}
-
-                self[i].append(int.from_bytes(byte, byteorder="little", signed=True))
-                j += 1
-                if j >= self.MAIN_MEMORY_WORDS_PER_BLOCK:
-                    j = 0
-                    i += self.MAIN_MEMORY_BLOCK_SIZE
-                    self[i] = []    # initialize list at next index
+
+        # copy each block so this Memory can be written without touching the
+        # parsed image shared by every other Memory in this process
+        image = load_init_image(self.MAIN_MEMORY_INIT_FILE, int(self.MAIN_MEMORY_WORDS_PER_BLOCK), self.MAIN_MEMORY_BLOCK_SIZE)
+        for addr, block in image.items():
+            self[addr] = list(block)
     
     def mm_read(self, addr) -> list:
         if addr in self:
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import contextlib
+import io
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from runcache           import CacheRunner, parse_access
+
+
+# trace columns laid out back to back in one shared memory buffer of int64s
+OP, ADDR, DATA, ORDER = range(4)
+OP_READ, OP_WRITE, OP_INVALID = 0, 1, -1
+INT64_MIN, INT64_MAX = -2**63, 2**63 - 1
+
+
+def attach_columns(shm, n):
+    words = shm.buf.cast("q")
+    return [words[col * n:(col + 1) * n] for col in (OP, ADDR, DATA, ORDER)]
+
+
+def run_shard(shm_name, n, start, end, structure, ways, sets) -> dict:
+    '''
+    Replays the accesses order[start:end] (every access to this shard's sets,
+    in trace order) on a fresh cache in a worker process.  Returns each
+    access's printed text, the counters, and the cache and main memory
+    blocks this shard touched.
+    '''
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        columns = attach_columns(shm, n)
+        try:
+            ops, addrs, data, order = columns
+            indices = order[start:end].tolist()
+            runner = CacheRunner(structure, ways, sets, None)
+            out = io.StringIO()
+            texts = []
+            with contextlib.redirect_stdout(out):
+                for i in indices:
+                    if ops[i] == OP_WRITE:
+                        runner.step("W", addrs[i], data[i])
+                    else:
+                        runner.step("R", addrs[i])
+                    texts.append(out.getvalue())
+                    out.seek(0)
+                    out.truncate(0)
+            touched = {addrs[i] - addrs[i] % runner.c.mm.MAIN_MEMORY_BLOCK_SIZE for i in indices}
+        finally:
+            # shm.close() refuses while any view into the buffer is alive, which would hide the real error
+            del ops, addrs, data, order
+            for view in columns:
+                view.release()
+    finally:
+        shm.close()
+
+    c = runner.c
+    return {
+        "indices":  indices,
+        "texts":    texts,
+        "counters": (c.cache_write_queries, c.cache_read_queries, c.cache_write_misses, c.cache_read_misses,
+                     c.mm.write_queries, c.mm.read_queries),
+        # pickled together so cache lines stay aliased to their main memory blocks, as in a serial run
+        "state":    (c.cache, {addr: c.mm[addr] for addr in touched}),
+    }
+
+
+class PartitionedCacheRunner(CacheRunner):
+    '''
+    Runs a DMC or SAC trace with its sets split across `jobs` processes.
+    Sets never share blocks (and SAC's LRU only ever compares ways within
+    one set), so each shard sees exactly the accesses a serial run would
+    give those sets; the shards' output, counters and final cache/memory
+    state are then stitched back together in trace order.  Anything that
+    can't be partitioned falls back to the serial CacheRunner.run().
+    '''
+
+    def __init__(self, structure, ways, sets, testfile, jobs):
+        super().__init__(structure, ways, sets, testfile)
+        self.ways = ways
+        self.jobs = jobs
+
+    def run(self):
+        with self.open_testfile() as t:
+            lines = t.readlines()
+        accesses = self.parse_trace(lines)
+        if accesses is None or self.jobs < 2 or self.cache_type not in ("dmc", "sac") or self.num_sets < 1:
+            # replay serially; this also reproduces the serial failure (traceback) on a bad trace
+            self.simulate(lines)
+        else:
+            self.simulate_partitioned(accesses)
+        self.print_stats()
+
+    def parse_trace(self, lines):
+        # None if any access would make the serial run raise (misaligned, bad hex, data too big for the buffer)
+        accesses = []
+        for line in lines:
+            try:
+                access = parse_access(line)
+            except ValueError:
+                return None
+            if access and (access[1] % self.c.mm.MAIN_MEMORY_WORD_SIZE != 0 or
+                           not INT64_MIN <= (access[2] or 0) <= INT64_MAX):
+                return None
+            accesses.append(access)
+        return accesses
+
+    def set_index(self, addr):
+        # same set as base_addr_to_dmc_index(), without walking every block below addr
+        return (addr // self.c.mm.MAIN_MEMORY_BLOCK_SIZE) % self.num_sets
+
+    def simulate_partitioned(self, accesses):
+        n = len(accesses)
+        num_shards = min(self.jobs, self.num_sets)
+
+        # bucket trace positions by shard (set s goes to shard s % num_shards), keeping trace order
+        buckets = [[] for _ in range(num_shards)]
+        for i, access in enumerate(accesses):
+            if access:
+                buckets[self.set_index(access[1]) % num_shards].append(i)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(8, 4 * n * 8))
+        try:
+            columns = attach_columns(shm, n)
+            try:
+                ops, addrs, data, order = columns
+                ops[:]   = array("q", (OP_INVALID if a is None else OP_WRITE if a[0] == "W" else OP_READ for a in accesses))
+                addrs[:] = array("q", (a[1] if a else 0 for a in accesses))
+                data[:]  = array("q", ((a[2] or 0) if a else 0 for a in accesses))
+                bounds = []
+                pos = 0
+                for bucket in buckets:
+                    order[pos:pos + len(bucket)] = array("q", bucket)
+                    bounds.append((pos, pos + len(bucket)))
+                    pos += len(bucket)
+            finally:
+                del ops, addrs, data, order
+                for view in columns:
+                    view.release()
+
+            with ProcessPoolExecutor(max_workers=num_shards) as pool:
+                futures = [pool.submit(run_shard, shm.name, n, start, end, self.cache_type, self.ways, self.num_sets)
+                           for start, end in bounds if end > start]
+                shards = [f.result() for f in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        texts = ["Invalid test format\n" if a is None else None for a in accesses]
+        ticks = []      # serial LRU tick of each trace position: every access ticks exactly once
+        tick = 0
+        for a in accesses:
+            tick += 1 if a else 0
+            ticks.append(tick)
+        for shard in shards:
+            for i, text in zip(shard["indices"], shard["texts"]):
+                texts[i] = text
+            self.merge_shard(shard, accesses, ticks)
+        sys.stdout.write("".join(texts))
+        if self.cache_type == "sac":
+            self.c.last_use = tick
+
+    def merge_shard(self, shard, accesses, ticks):
+        c = self.c
+        write_q, read_q, write_m, read_m, mm_writes, mm_reads = shard["counters"]
+        c.cache_write_queries += write_q
+        c.cache_read_queries  += read_q
+        c.cache_write_misses  += write_m
+        c.cache_read_misses   += read_m
+        c.mm.write_queries    += mm_writes
+        c.mm.read_queries     += mm_reads
+
+        cache, blocks = shard["state"]
+        c.mm.update(blocks)
+        for set_num in {self.set_index(accesses[i][1]) for i in shard["indices"]}:
+            if self.cache_type == "sac":
+                # the shard's tick t is its t-th access; swap in that access's serial tick
+                for way in cache[set_num].values():
+                    if way["last-use"]:
+                        way["last-use"] = ticks[shard["indices"][way["last-use"] - 1]]
+            c.cache[set_num] = cache[set_num]
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import contextlib
 import re
+import sys
 
 from simple             import SimpleCache
 from direct             import DirectMappedCache
@@ -32,7 +34,7 @@ def parse_cli_args():
         type=str,
         default='tests/t1.test',
         # required=True,
-        help='the test trace file (with read/write addrs and vals) to run')
+        help='the test trace file (with read/write addrs and vals) to run, or - to read it from stdin')
 
     parser.add_argument(
         '--cachetype',
@@ -42,9 +44,30 @@ def parse_cli_args():
         help='the cache structure type (simple, DMC, SAC, or FAC)'
     )
 
+    parser.add_argument(
+        '--server',
+        type=str,
+        default=None,
+        help='run on a simserver.py instance instead of locally (unix socket path or host:port); not combinable with --jobs')
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='split a DMC or SAC trace by set across this many processes')
+
     return parser.parse_args()
 
 
+# Parse one trace line into ("W", addr, data) or ("R", addr, None); None if malformed
+def parse_access(line):
+    if matches := re.search(r"^W\s+(0x[0-9a-zA-Z]{4})\s+(-?[0-9]+)\s*$", line):
+        return "W", int(matches.group(1), base=16), int(matches.group(2))
+    elif matches := re.search(r"^R\s+(0x[0-9a-zA-Z]{4})\s*$", line):
+        return "R", int(matches.group(1), base=16), None
+    return None
+
+
 class CacheRunner():
     def __init__(self, structure, ways, sets, testfile):
         self.cache_type = structure
@@ -68,24 +91,34 @@ class CacheRunner():
             self.c = SetAssociativeCache(self.num_sets, self.num_ways)
             self.descriptor = f"{self.cache_type} cache with {self.num_sets} set(s) and {self.num_ways} way(s)\n*******************************************"
 
+    def open_testfile(self):
+        # "-" reads the trace from stdin (without closing it)
+        if self.testfile == "-":
+            return contextlib.nullcontext(sys.stdin)
+        return open(self.testfile, "r")
+
     def run(self):
-        with open(self.testfile, "r") as t:
-            while(line := t.readline()):
-                if matches := re.search(r"^W\s+(0x[0-9a-zA-Z]{4})\s+(-?[0-9]+)\s*$", line):
-                    addr = int(matches.group(1), base=16)
-                    data = int(matches.group(2))
-                    self.c.store_word(addr, data)
-                    print(f"{self.cache_type}: Wrote to {'0x{:04x}'.format(addr)}: {data}\n")
-                elif matches := re.search(r"^R\s+(0x[0-9a-zA-Z]{4})\s*$", line):
-                    addr = int(matches.group(1), base=16)
-                    readval = self.c.load_word(addr)
-                    print(f"{self.cache_type}: Read from {'0x{:04x}'.format(addr)} the value: {readval}\n")
-                else:
-                    print("Invalid test format")
+        with self.open_testfile() as t:
+            self.simulate(t)
         self.print_stats()
 
-    def print_stats(self):
-        print("\n\n*******************************************")
+    def simulate(self, trace):
+        # trace is any iterable of lines (an open test file, a StringIO, ...)
+        for line in trace:
+            if access := parse_access(line):
+                self.step(*access)
+            else:
+                print("Invalid test format")
+
+    def step(self, op, addr, data=None):
+        if op == "W":
+            self.c.store_word(addr, data)
+            print(f"{self.cache_type}: Wrote to {'0x{:04x}'.format(addr)}: {data}\n")
+        else:
+            readval = self.c.load_word(addr)
+            print(f"{self.cache_type}: Read from {'0x{:04x}'.format(addr)} the value: {readval}\n")
+
+    def stats(self) -> dict:
         write_hits      = self.c.cache_write_queries - self.c.cache_write_misses
         write_hit_rate  = write_hits/self.c.cache_write_queries * 100 if self.c.cache_write_queries else 0
         read_hits       = self.c.cache_read_queries - self.c.cache_read_misses
@@ -96,18 +129,47 @@ class CacheRunner():
         queries         = self.c.cache_write_queries + self.c.cache_read_queries
         misses          = self.c.cache_write_misses + self.c.cache_read_misses
         amat = self.hit_time + (misses/queries)*self.miss_penalty if queries else 0
+        return {
+            "write_hits":       write_hits,
+            "write_queries":    self.c.cache_write_queries,
+            "write_hit_rate":   write_hit_rate,
+            "read_hits":        read_hits,
+            "read_queries":     self.c.cache_read_queries,
+            "read_hit_rate":    read_hit_rate,
+            "total_hits":       total_hits,
+            "total_queries":    total_queries,
+            "total_hit_rate":   total_hit_rate,
+            "mm_writes":        self.c.mm.write_queries,
+            "mm_reads":         self.c.mm.read_queries,
+            "amat":             amat,
+        }
+
+    def print_stats(self):
+        print("\n\n*******************************************")
+        s = self.stats()
         print(self.descriptor)
-        print(f"Write Hit Rate:	    {'{:.2f}'.format(write_hit_rate)}% ({write_hits}/{self.c.cache_write_queries})")
-        print(f"Read Hit Rate:	    {'{:.2f}'.format(read_hit_rate)}% ({read_hits}/{self.c.cache_read_queries})")
-        print(f"Total Hit Rate:     {'{:.2f}'.format(total_hit_rate)}% ({total_hits}/{total_queries})")
-        print(f"Writes to Main Memory:   {self.c.mm.write_queries}")
-        print(f"Reads from Main Memory:  {self.c.mm.read_queries}")
-        print(f"Avg. Memory Access Time: {'{:.2f}'.format(amat)} cycles")
+        print(f"Write Hit Rate:	    {'{:.2f}'.format(s['write_hit_rate'])}% ({s['write_hits']}/{s['write_queries']})")
+        print(f"Read Hit Rate:	    {'{:.2f}'.format(s['read_hit_rate'])}% ({s['read_hits']}/{s['read_queries']})")
+        print(f"Total Hit Rate:     {'{:.2f}'.format(s['total_hit_rate'])}% ({s['total_hits']}/{s['total_queries']})")
+        print(f"Writes to Main Memory:   {s['mm_writes']}")
+        print(f"Reads from Main Memory:  {s['mm_reads']}")
+        print(f"Avg. Memory Access Time: {'{:.2f}'.format(s['amat'])} cycles")
         print("*******************************************")
 
 
 def main():
     cli_args = parse_cli_args()
+    if cli_args.server and cli_args.jobs > 1:
+        sys.exit("runcache.py: error: --jobs can't be used with --server")
+    if cli_args.server:
+        # thin client: the server already has the caches imported and main memory loaded
+        import simclient
+        simclient.run_remote(cli_args.server, cli_args.cachetype, cli_args.num_ways, cli_args.num_sets, cli_args.testfile)
+        return
+    if cli_args.jobs > 1:
+        from partition import PartitionedCacheRunner
+        PartitionedCacheRunner(cli_args.cachetype, cli_args.num_ways, cli_args.num_sets, cli_args.testfile, cli_args.jobs).run()
+        return
     CacheRunner(cli_args.cachetype, cli_args.num_ways, cli_args.num_sets, cli_args.testfile).run()
 
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Kept to the standard library basics so `runcache.py --server` starts as fast as
+# possible; everything heavy lives in the server (simserver.py).
+import json
+import os
+import socket
+import sys
+
+
+def parse_address(address):
+    '''
+    "host:port" is a TCP address, anything else is a unix socket path.
+    '''
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def submit(address, job) -> dict:
+    '''
+    Sends one job to a running simserver and waits for its reply.
+    '''
+    address = parse_address(address)
+    if isinstance(address, tuple):
+        conn = socket.create_connection(address)
+    else:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(address)
+    with conn, conn.makefile("rwb") as f:
+        f.write((json.dumps(job) + "\n").encode())
+        f.flush()
+        line = f.readline()
+    if not line:
+        raise ConnectionError("simserver closed the connection without replying")
+    return json.loads(line)
+
+
+def run_remote(address, structure, ways, sets, testfile):
+    # same output as CacheRunner(...).run(); a testfile of "-" streams the trace from stdin
+    job = {"cachetype": structure, "num_ways": ways, "num_sets": sets}
+    if testfile == "-":
+        job["trace"] = sys.stdin.read()
+    else:
+        job["testfile"] = os.path.abspath(testfile)    # the server may run from another directory
+    reply = submit(address, job)
+    sys.stdout.write(reply["output"])
+    if "error" in reply:
+        sys.stdout.flush()
+        sys.stderr.write(reply["error"])
+        sys.exit(1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from runcache           import CacheRunner
+from mainmem            import Memory
+
+
+STREAM_LIMIT = 64 * 1024 * 1024     # largest request line (i.e. inline trace) we accept
+
+
+# Parse command-line arguments passed to the program
+def parse_cli_args():
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '--socket',
+        type=str,
+        default=None,
+        help='listen on this unix socket path')
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8410,
+        help='listen on this localhost TCP port (when no --socket is given)')
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count(),
+        help='the number of simulation processes in the worker pool')
+
+    return parser.parse_args()
+
+
+def warm_worker():
+    # read mm_init.data once per worker; every job after this copies the parsed image
+    Memory()
+
+
+def run_job(job) -> dict:
+    '''
+    Runs one simulation in a worker process.
+    A job is { cachetype, num_ways, num_sets } plus either a `testfile` path
+    or the `trace` text itself.  Returns everything runcache.py would have
+    printed as `output`, plus the final `stats` (or an `error`).
+    '''
+    out = io.StringIO()
+    reply = {}
+    try:
+        with contextlib.redirect_stdout(out):
+            runner = CacheRunner(job["cachetype"], job.get("num_ways", 8), job.get("num_sets", 8), job.get("testfile"))
+            if "trace" in job:
+                runner.simulate(io.StringIO(job["trace"]))
+                runner.print_stats()
+            else:
+                runner.run()
+        reply["stats"] = runner.stats()
+    except Exception:
+        reply["error"] = traceback.format_exc()
+    reply["output"] = out.getvalue()
+    return reply
+
+
+class WorkerPool():
+    '''
+    The simulation process pool, rebuilt whenever a worker dies and breaks it.
+    '''
+    def __init__(self, workers):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker)
+
+    async def run(self, job) -> dict:
+        pool = self.pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, run_job, job)
+        except BrokenProcessPool:
+            if pool is self.pool:   # only the first job to notice replaces the pool
+                print("simserver: worker pool broke, starting a new one", file=sys.stderr)
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+                pool.shutdown(wait=False)
+            return {"error": traceback.format_exc(), "output": ""}
+        except Exception:
+            return {"error": traceback.format_exc(), "output": ""}
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def handle_client(reader, writer, pool):
+    # one JSON job per line, answered in order with one JSON reply per line
+    try:
+        while (line := await reader.readline()):
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                reply = {"error": f"bad request: {e}\n", "output": ""}
+            else:
+                reply = await pool.run(job)
+            writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        pass    # client went away or sent an oversized line; drop the connection
+    finally:
+        writer.close()
+
+
+async def serve(cli_args):
+    pool = WorkerPool(cli_args.workers)
+    handler = lambda r, w: handle_client(r, w, pool)
+    if cli_args.socket:
+        if os.path.exists(cli_args.socket):
+            os.unlink(cli_args.socket)     # stale socket from a previous server
+        server = await asyncio.start_unix_server(handler, path=cli_args.socket, limit=STREAM_LIMIT)
+        where = cli_args.socket
+    else:
+        server = await asyncio.start_server(handler, host="127.0.0.1", port=cli_args.port, limit=STREAM_LIMIT)
+        where = f"127.0.0.1:{cli_args.port}"
+    print(f"simserver: listening on {where} with {cli_args.workers} worker(s)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.shutdown()
+        if cli_args.socket and os.path.exists(cli_args.socket):
+            os.unlink(cli_args.socket)
+
+
+def main():
+    cli_args = parse_cli_args()
+    # treat `kill` like Ctrl-C so the unix socket gets cleaned up
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        warm_worker()   # fail now, not in every worker, if main memory can't be loaded
+    except OSError as e:
+        sys.exit(f"simserver: cannot load main memory: {e}")
+    try:
+        asyncio.run(serve(cli_args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,9 @@
 text=".txt"
 t=".test"
 
+# set SIMSERVER to a running simserver.py address (socket path or host:port) to skip per-run startup
+server=${SIMSERVER:+--server $SIMSERVER}
+
 testlist=(
 	1
 	2
@@ -42,7 +45,7 @@ echo "checking dmc..."
 
 for i in ${testlist[@]}; do
 	echo "$i"
-	python3 runcache.py --cachetype dmc --num_sets 16 --num_ways 1 --testfile tests/t${i}${t} > tests/test_dmc/t${i}${text}
+	python3 runcache.py --cachetype dmc --num_sets 16 --num_ways 1 --testfile tests/t${i}${t} $server > tests/test_dmc/t${i}${text}
 	if [[ $(diff tests/results_dmc/t${i}${text} tests/test_dmc/t${i}${text}) ]]; then
 		echo "dmc: error in test $i"
 	fi
@@ -59,7 +62,7 @@ echo "checking fac..."
 
 for i in ${testlist[@]}; do
 	echo "$i"
-	python3 runcache.py --cachetype fac --num_sets 0 --num_ways 16 --testfile tests/t${i}${t} > tests/test_fac/t${i}${text}
+	python3 runcache.py --cachetype fac --num_sets 0 --num_ways 16 --testfile tests/t${i}${t} $server > tests/test_fac/t${i}${text}
  	if [[ $(diff tests/results_fac/t${i}${text} tests/test_fac/t${i}${text}) ]]; then
  		echo "fac: error in test $i"
  	fi
@@ -78,7 +81,7 @@ echo "checking sac..."
 
 for i in ${testlist[@]}; do
  	echo "$i"
- 	python3 runcache.py --cachetype sac --num_sets 8 --num_ways 2 --testfile tests/t${i}${t} > tests/test_sac/t${i}${text}
+ 	python3 runcache.py --cachetype sac --num_sets 8 --num_ways 2 --testfile tests/t${i}${t} $server > tests/test_sac/t${i}${text}
  	if [[ $(diff tests/results_sac/t${i}${text} tests/test_sac/t${i}${text}) ]]; then
  		echo "sac: error in test $i"
  	fi
@@ -90,4 +93,8 @@ else
  	echo "sac: all tests passed!"
 fi
 
+## partitioned (--jobs) runs must match serial runs exactly
+echo "checking partition..."
+python3 check_partition.py tests/t*${t}
+
 # exit 0